@@ -1,6 +1,7 @@
 """Ubibot integration with preflight refresh (uses /channels/list only)."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import timedelta
 
@@ -10,7 +11,7 @@ from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import DOMAIN, DEFAULT_POLL_SECONDS
-from .coordinator import UbibotCoordinator
+from .coordinator import UbibotAccountCoordinator, UbibotCoordinator
 from .options_flow import UbibotOptionsFlow
 
 _LOGGER = logging.getLogger(__name__)
@@ -24,32 +25,69 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "channels": entry.data.get("channels", []),
         "poll_map": dict(entry.options.get("poll_map", {})),
         "sensor_map": dict(entry.options.get("sensor_map", {})),
+        "account_coord": None,
         "coordinators": {},
     }
 
+    store["sensor_map_norm"] = {
+        cid: frozenset((f or "").lower() for f in fields)
+        for cid, fields in store["sensor_map"].items()
+    }
+
     session = async_get_clientsession(hass)
     account_key: str = entry.data.get("account_key")
 
+    poll_intervals = {
+        str(ch.get("channel_id")): timedelta(
+            seconds=int(store["poll_map"].get(str(ch.get("channel_id")), DEFAULT_POLL_SECONDS))
+        )
+        for ch in store["channels"]
+    }
+    account = UbibotAccountCoordinator(
+        hass=hass,
+        entry=entry,
+        session=session,
+        account_key=account_key,
+        poll_intervals=poll_intervals,
+    )
+    try:
+        await account.async_config_entry_first_refresh()
+    except Exception as err:
+        _LOGGER.warning("Initial refresh of the Ubibot channel list failed: %s", err)
+        raise ConfigEntryNotReady(str(err)) from err
+
+    store["account_coord"] = account
+
+    coords: list[UbibotCoordinator] = []
     for ch in store["channels"]:
         channel_id = str(ch.get("channel_id"))
         channel_name = ch.get("name") or channel_id
-        seconds = int(store["poll_map"].get(channel_id, DEFAULT_POLL_SECONDS))
-
-        coord = UbibotCoordinator(
-            hass=hass,
-            session=session,
-            account_key=account_key,
-            channel_id=channel_id,
-            channel_name=channel_name,
-            update_interval=timedelta(seconds=seconds),
+        coords.append(
+            UbibotCoordinator(
+                hass=hass,
+                entry=entry,
+                account=account,
+                channel_id=channel_id,
+                channel_name=channel_name,
+            )
         )
-        try:
-            await coord.async_config_entry_first_refresh()
-        except Exception as err:
-            _LOGGER.warning("Initial refresh failed for channel %s (%s): %s", channel_name, channel_id, err)
-            raise ConfigEntryNotReady(str(err)) from err
 
-        store["coordinators"][channel_id] = coord
+    results = await asyncio.gather(
+        *(coord.async_config_entry_first_refresh() for coord in coords),
+        return_exceptions=True,
+    )
+    for coord, result in zip(coords, results):
+        if isinstance(result, BaseException):
+            _LOGGER.warning(
+                "Initial refresh failed for channel %s (%s): %s",
+                coord.channel_name, coord.channel_id, result,
+            )
+            await coord.async_shutdown()
+            continue
+        store["coordinators"][coord.channel_id] = coord
+
+    if coords and not store["coordinators"]:
+        raise ConfigEntryNotReady("Initial refresh failed for all Ubibot channels")
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
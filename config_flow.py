@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import functools
 import logging
-import re
+import orjson
 import voluptuous as vol
 from aiohttp import ClientSession, ClientError
 from homeassistant import config_entries
@@ -14,16 +15,29 @@ from .const import (
 )
 
 _LOGGER = logging.getLogger(__name__)
-_FIELD_RE = re.compile(r"^field(\d{1,2})$", re.IGNORECASE)
 
+_ACCOUNT_KEY_SCHEMA = vol.Schema({vol.Required(CONF_ACCOUNT_KEY): str})
+_POLL_INT = vol.All(vol.Coerce(int), vol.Range(min=MIN_POLL_SECONDS, max=MAX_POLL_SECONDS))
+
+@functools.lru_cache(maxsize=256)
 def _canon(key: str | None) -> str | None:
-    if not key: return None
-    m = _FIELD_RE.match(str(key).strip())
-    if not m: return None
-    return f"field{int(m.group(1))}"
+    if not key:
+        return None
+    s = str(key).strip().lower()
+    if not s.startswith("field"):
+        return None
+    tail = s[5:]
+    if not (1 <= len(tail) <= 2 and tail.isdecimal()):
+        return None
+    return f"field{int(tail)}"
+
+@functools.lru_cache(maxsize=32)
+def _display_cached(items: tuple[tuple[str, str], ...]) -> dict[str, str]:
+    return {k: (v or k).title() for k, v in items}
 
 def _display_from_labels(labels: dict[str, str]) -> dict[str, str]:
-    return {k: (v or k).title() for k, v in labels.items()}
+    # Keyed on the ordered items: the multi-select shows fields in label order.
+    return _display_cached(tuple(labels.items()))
 
 class UbibotConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
@@ -33,7 +47,7 @@ class UbibotConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             if resp.status != 200:
                 text = await resp.text()
                 raise RuntimeError(f"HTTP {resp.status}: {text[:200]}")
-            return await resp.json()
+            return orjson.loads(await resp.read())
 
     async def _fetch_channels(self, session: ClientSession, account_key: str):
         url = f"{API_BASE}/channels/list?account_key={account_key}"
@@ -56,9 +70,8 @@ class UbibotConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 labels[ck] = v.strip()
         lv = raw.get("last_values")
         if isinstance(lv, str):
-            import json as _json
             try:
-                lv = _json.loads(lv)
+                lv = orjson.loads(lv)
             except Exception:
                 lv = {}
         if isinstance(lv, dict):
@@ -73,8 +86,7 @@ class UbibotConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_user(self, user_input=None):
         errors = {}
         if user_input is None:
-            schema = vol.Schema({vol.Required(CONF_ACCOUNT_KEY): str})
-            return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
+            return self.async_show_form(step_id="user", data_schema=_ACCOUNT_KEY_SCHEMA, errors=errors)
 
         account_key = user_input[CONF_ACCOUNT_KEY]
         session = async_get_clientsession(self.hass)
@@ -105,15 +117,13 @@ class UbibotConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             selected_ids = [cid for cid, enabled in raw.items() if enabled] or list(raw.keys())
         else:
             selected_ids = [str(cid) for cid in raw] or [c["channel_id"] for c in self._all_channels]
-        self._selected_ids = selected_ids
+        self._selected_ids = set(selected_ids)
 
         poll_schema_fields = {}
         for ch in self._all_channels:
             cid = ch["channel_id"]
             if cid in self._selected_ids:
-                poll_schema_fields[vol.Required(f"poll_{cid}", default=DEFAULT_POLL_SECONDS)] = vol.All(
-                    vol.Coerce(int), vol.Range(min=MIN_POLL_SECONDS, max=MAX_POLL_SECONDS)
-                )
+                poll_schema_fields[vol.Required(f"poll_{cid}", default=DEFAULT_POLL_SECONDS)] = _POLL_INT
 
         return self.async_show_form(step_id="poll_intervals", data_schema=vol.Schema(poll_schema_fields))
 
@@ -125,9 +135,9 @@ class UbibotConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 self._poll_map[cid] = int(val)
 
         self._sensor_labels = {}
-        by_id = {c["channel_id"]: c for c in self._all_channels}
-        for cid in self._selected_ids:
-            self._sensor_labels[cid] = self._labels_from_cached_channel(by_id[cid])
+        for ch in self._all_channels:
+            if ch["channel_id"] in self._selected_ids:
+                self._sensor_labels[ch["channel_id"]] = self._labels_from_cached_channel(ch)
 
         fields = {}
         for cid, labels in self._sensor_labels.items():
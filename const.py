@@ -1,3 +1,5 @@
+import sys
+
 DOMAIN = "ubibot"
 
 CONF_ACCOUNT_KEY = "account_key"
@@ -11,4 +13,6 @@ DEFAULT_POLL_SECONDS = 600
 MIN_POLL_SECONDS = 60
 MAX_POLL_SECONDS = 3600
 
+SP1_PRODUCT_ID = sys.intern("ubibot-sp1a")
+
 KNOWN_FIELDS = [f"field{i}" for i in range(1, 16)]
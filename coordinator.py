@@ -1,68 +1,197 @@
-"""Shared DataUpdateCoordinator for Ubibot channels (polls via /channels/list)."""
+"""Shared DataUpdateCoordinators for Ubibot channels (polls via /channels/list)."""
 from __future__ import annotations
 
-import json
+import asyncio
+import functools
 import logging
 from datetime import timedelta
 from typing import Any
 
+import orjson
 from aiohttp import ClientSession, ClientError
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.update_coordinator import (
+    REQUEST_REFRESH_DEFAULT_COOLDOWN, DataUpdateCoordinator, UpdateFailed
+)
+from homeassistant.core import HomeAssistant, callback
 
 from .const import API_BASE
 
 _LOGGER = logging.getLogger(__name__)
 
-class UbibotCoordinator(DataUpdateCoordinator[dict[str, Any] | None]):
-    """Coordinator that polls a single channel (device) by reusing /channels/list."""
+@functools.lru_cache(maxsize=256)
+def _canon(key: str | None) -> str | None:
+    if not key:
+        return None
+    s = str(key).strip().lower()
+    if not s.startswith("field"):
+        return None
+    tail = s[5:]
+    if not (1 <= len(tail) <= 2 and tail.isdecimal()):
+        return None
+    return f"field{int(tail)}"
+
+def _extract_labels(ch: dict[str, Any]) -> dict[str, str]:
+    labels: dict[str, str] = {}
+    for k, v in ch.items():
+        ck = _canon(k)
+        if ck and isinstance(v, str) and v.strip():
+            labels[ck] = v.strip()
+    return labels
+
+class UbibotAccountCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
+    """Coordinator that fetches /channels/list once per tick and indexes it by channel_id."""
 
     def __init__(
         self,
         hass: HomeAssistant,
+        entry: ConfigEntry,
         session: ClientSession,
         account_key: str,
-        channel_id: str,
-        channel_name: str,
-        update_interval: timedelta,
+        poll_intervals: dict[str, timedelta],
     ) -> None:
         self.session = session
         self.account_key = account_key
-        self.channel_id = channel_id
-        self.channel_name = channel_name
+        self.poll_intervals = poll_intervals
         super().__init__(
             hass=hass,
             logger=_LOGGER,
-            name=f"Ubibot {channel_name} ({channel_id})",
-            update_interval=update_interval,
+            config_entry=entry,
+            name="Ubibot account",
+            update_interval=min(poll_intervals.values(), default=None),
+            always_update=False,
+            # Non-immediate: refresh requests from channel views within one cooldown share one fetch.
+            request_refresh_debouncer=Debouncer(
+                hass, _LOGGER, cooldown=REQUEST_REFRESH_DEFAULT_COOLDOWN, immediate=False
+            ),
         )
 
+    def set_poll_interval(self, channel_id: str, interval: timedelta) -> None:
+        """Record a channel's poll interval; the account polls at the shortest one."""
+        self.poll_intervals[channel_id] = interval
+        self.update_interval = min(self.poll_intervals.values())
+
     async def _async_update_data(self):
-        import asyncio
         url = f"{API_BASE}/channels/list?account_key={self.account_key}"
         try:
             async with self.session.get(url, timeout=20) as resp:
                 if resp.status != 200:
                     text = await resp.text()
                     raise UpdateFailed(f"HTTP {resp.status}: {text[:200]}")
-                data = await resp.json()
-                chans = data.get("channels", [])
-                channel = None
-                for c in chans:
-                    cid = str(c.get("channel_id") or c.get("id") or "")
-                    if cid == self.channel_id:
-                        channel = c
-                        break
-                if channel is None:
-                    raise UpdateFailed(f"Channel {self.channel_id} not found in list")
-                lv = channel.get("last_values")
-                if isinstance(lv, str):
-                    try:
-                        channel["last_values"] = json.loads(lv)
-                    except Exception:
-                        channel["last_values"] = {}
-                return {"channel": channel}
+                data = orjson.loads(await resp.read())
         except (ClientError, asyncio.TimeoutError) as err:
             raise UpdateFailed(err) from err
+        except UpdateFailed:
+            raise
         except Exception as err:
             raise UpdateFailed(err) from err
+
+        channels: dict[str, dict[str, Any]] = {}
+        for c in data.get("channels", []):
+            cid = str(c.get("channel_id") or c.get("id") or "")
+            if not cid:
+                continue
+            lv = c.get("last_values")
+            if isinstance(lv, str):
+                try:
+                    lv = orjson.loads(lv)
+                except Exception:
+                    lv = {}
+            if not isinstance(lv, dict):
+                lv = {}
+            slim: dict[str, Any] = {
+                "channel_id": cid,
+                "name": c.get("name"),
+                "product_id": c.get("product_id"),
+                "last_values": lv,
+            }
+            lv_canon: dict[str, Any] = {}
+            for k, v in lv.items():
+                ck = _canon(k)
+                if ck:
+                    lv_canon[ck] = v
+            slim["_lv_canon"] = lv_canon
+            slim["_values"] = {
+                ck: (v["value"] if isinstance(v, dict) and "value" in v else v)
+                for ck, v in lv_canon.items()
+            }
+            # Keep only the fieldN label strings; feeds/metadata are never read.
+            for k, v in c.items():
+                if isinstance(v, str) and _canon(k):
+                    slim[k] = v
+            channels[cid] = slim
+        return channels
+
+class UbibotCoordinator(DataUpdateCoordinator[dict[str, Any] | None]):
+    """Per-channel view over the account coordinator; never touches the network itself."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        account: UbibotAccountCoordinator,
+        channel_id: str,
+        channel_name: str,
+    ) -> None:
+        self.account = account
+        self.channel_id = channel_id
+        self.channel_name = channel_name
+        self.labels: dict[str, str] = {}
+        super().__init__(
+            hass=hass,
+            logger=_LOGGER,
+            config_entry=entry,
+            name=f"Ubibot {channel_name} ({channel_id})",
+            update_interval=None,
+            always_update=False,
+        )
+        self._unsub_account = account.async_add_listener(self._handle_account_update)
+
+    @property
+    def account_key(self) -> str:
+        return self.account.account_key
+
+    @property
+    def poll_interval(self) -> timedelta | None:
+        return self.account.poll_intervals.get(self.channel_id)
+
+    def _channel_payload(self) -> dict[str, Any]:
+        channel = (self.account.data or {}).get(self.channel_id)
+        if channel is None:
+            raise UpdateFailed(f"Channel {self.channel_id} not found in list")
+        return {"channel": channel}
+
+    @callback
+    def _handle_account_update(self) -> None:
+        if not self.account.last_update_success:
+            self.async_set_update_error(self.account.last_exception)
+            return
+        try:
+            payload = self._channel_payload()
+        except UpdateFailed as err:
+            self.async_set_update_error(err)
+            return
+        if self.last_update_success and payload == self.data:
+            # Another channel changed; this one did not, so skip the listener fan-out.
+            return
+        self.async_set_updated_data(payload)
+
+    async def _async_setup(self) -> None:
+        """Learn the channel's field labels once, before the first refresh."""
+        self.labels = _extract_labels(self._channel_payload()["channel"])
+
+    async def _async_update_data(self):
+        return self._channel_payload()
+
+    async def async_request_refresh(self) -> None:
+        """Refresh the shared channel list; this view follows via its listener."""
+        await self.account.async_request_refresh()
+
+    async def async_shutdown(self) -> None:
+        """Detach from the account coordinator before shutting down."""
+        # HA also runs this on entry unload, so it may be called more than once.
+        if self._unsub_account is not None:
+            self._unsub_account()
+            self._unsub_account = None
+        await super().async_shutdown()
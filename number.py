@@ -63,7 +63,7 @@ class UbibotPollNumber(NumberEntity):
 
     @property
     def native_value(self) -> float | None:
-        interval = getattr(self.coordinator, "update_interval", None)
+        interval = self.coordinator.poll_interval
         if interval is None:
             return None
         try:
@@ -78,8 +78,8 @@ class UbibotPollNumber(NumberEntity):
         except Exception:
             seconds = MIN_POLL_SECONDS
 
-        # 1) Apply live
-        self.coordinator.update_interval = timedelta(seconds=seconds)
+        # 1) Apply live (the shared account poll follows the shortest channel interval)
+        self.coordinator.account.set_poll_interval(self._channel_id, timedelta(seconds=seconds))
 
         # 2) Persist options in a background task (do not await here)
         self.hass.async_create_task(self._persist_options(seconds))
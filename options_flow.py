@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import functools
 import logging
-import re
+import orjson
 import voluptuous as vol
 from aiohttp import ClientSession, ClientError
 from homeassistant import config_entries
@@ -14,16 +15,28 @@ from .const import (
 )
 
 _LOGGER = logging.getLogger(__name__)
-_FIELD_RE = re.compile(r"^field(\d{1,2})$", re.IGNORECASE)
 
+_POLL_INT = vol.All(vol.Coerce(int), vol.Range(min=MIN_POLL_SECONDS, max=MAX_POLL_SECONDS))
+
+@functools.lru_cache(maxsize=256)
 def _canon(key: str | None) -> str | None:
-    if not key: return None
-    m = _FIELD_RE.match(str(key).strip())
-    if not m: return None
-    return f"field{int(m.group(1))}"
+    if not key:
+        return None
+    s = str(key).strip().lower()
+    if not s.startswith("field"):
+        return None
+    tail = s[5:]
+    if not (1 <= len(tail) <= 2 and tail.isdecimal()):
+        return None
+    return f"field{int(tail)}"
+
+@functools.lru_cache(maxsize=32)
+def _display_cached(items: tuple[tuple[str, str], ...]) -> dict[str, str]:
+    return {k: (v or k).title() for k, v in items}
 
 def _display_from_labels(labels: dict[str, str]) -> dict[str, str]:
-    return {k: (v or k).title() for k, v in labels.items()}
+    # Keyed on the ordered items: the multi-select shows fields in label order.
+    return _display_cached(tuple(labels.items()))
 
 class UbibotOptionsFlow(config_entries.OptionsFlow):
     """Allow changing channels, per-channel polling and sensor selection after setup."""
@@ -33,13 +46,15 @@ class UbibotOptionsFlow(config_entries.OptionsFlow):
         self._new_channels = None
         self._selected_ids = None
         self._new_poll_map = {}
+        self._polls_schema = None
+        self._sensors_schema = None
 
     async def _fetch_json(self, session: ClientSession, url: str):
         async with session.get(url, timeout=20) as resp:
             if resp.status != 200:
                 text = await resp.text()
                 raise RuntimeError(f"HTTP {resp.status}: {text[:200]}")
-            return await resp.json()
+            return orjson.loads(await resp.read())
 
     async def _fetch_channels(self, session: ClientSession, account_key: str):
         url = f"{API_BASE}/channels/list?account_key={account_key}"
@@ -62,9 +77,8 @@ class UbibotOptionsFlow(config_entries.OptionsFlow):
                 labels[ck] = v.strip()
         lv = raw.get("last_values")
         if isinstance(lv, str):
-            import json as _json
             try:
-                lv = _json.loads(lv)
+                lv = orjson.loads(lv)
             except Exception:
                 lv = {}
         if isinstance(lv, dict):
@@ -87,9 +101,14 @@ class UbibotOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             raw = user_input[CONF_CHANNELS]
             if isinstance(raw, dict):
-                self._selected_ids = [cid for cid, enabled in raw.items() if enabled] or list(raw.keys())
+                selected_ids = {cid for cid, enabled in raw.items() if enabled} or set(raw.keys())
             else:
-                self._selected_ids = [str(cid) for cid in raw] or list(choices.keys())
+                selected_ids = {str(cid) for cid in raw} or set(choices.keys())
+            if selected_ids != self._selected_ids:
+                # Channel selection changed: the cached step schemas are stale.
+                self._polls_schema = None
+                self._sensors_schema = None
+            self._selected_ids = selected_ids
             self._new_channels = [
                 {"channel_id": c["channel_id"], "name": c["name"], "_raw": c.get("_raw")}
                 for c in all_channels if c["channel_id"] in self._selected_ids
@@ -102,15 +121,6 @@ class UbibotOptionsFlow(config_entries.OptionsFlow):
         return self.async_show_form(step_id="init", data_schema=schema)
 
     async def async_step_polls(self, user_input=None):
-        fields = {}
-        poll_map = dict(self.entry.options.get(CONF_POLL_MAP, {}))
-        for ch in self._new_channels:
-            cid = ch["channel_id"]
-            default = int(poll_map.get(cid, DEFAULT_POLL_SECONDS))
-            fields[vol.Required(f"poll_{cid}", default=default)] = vol.All(
-                vol.Coerce(int), vol.Range(min=MIN_POLL_SECONDS, max=MAX_POLL_SECONDS)
-            )
-
         if user_input is not None:
             self._new_poll_map = {}
             for key, val in user_input.items():
@@ -119,18 +129,18 @@ class UbibotOptionsFlow(config_entries.OptionsFlow):
                     self._new_poll_map[cid] = int(val)
             return await self.async_step_sensors()
 
-        return self.async_show_form(step_id="polls", data_schema=vol.Schema(fields))
+        if self._polls_schema is None:
+            fields = {}
+            poll_map = dict(self.entry.options.get(CONF_POLL_MAP, {}))
+            for ch in self._new_channels:
+                cid = ch["channel_id"]
+                default = int(poll_map.get(cid, DEFAULT_POLL_SECONDS))
+                fields[vol.Required(f"poll_{cid}", default=default)] = _POLL_INT
+            self._polls_schema = vol.Schema(fields)
 
-    async def async_step_sensors(self, user_input=None):
-        fields = {}
-        for ch in self._new_channels:
-            cid = ch["channel_id"]
-            labels = self._labels_from_cached_channel(ch)
-            display = _display_from_labels(labels)
-            current = self.entry.options.get(CONF_SENSOR_MAP, {}).get(cid)
-            default_keys = list(display.keys() if current is None else current)
-            fields[vol.Required(f"sensors_{cid}", default=default_keys)] = cv.multi_select(display)
+        return self.async_show_form(step_id="polls", data_schema=self._polls_schema)
 
+    async def async_step_sensors(self, user_input=None):
         if user_input is not None:
             new_sensor_map = {}
             for key, val in user_input.items():
@@ -150,4 +160,15 @@ class UbibotOptionsFlow(config_entries.OptionsFlow):
             self.hass.config_entries.async_update_entry(self.entry, data=new_data, options=new_options)
             return self.async_create_entry(title="", data={})
 
-        return self.async_show_form(step_id="sensors", data_schema=vol.Schema(fields))
+        if self._sensors_schema is None:
+            fields = {}
+            for ch in self._new_channels:
+                cid = ch["channel_id"]
+                labels = self._labels_from_cached_channel(ch)
+                display = _display_from_labels(labels)
+                current = self.entry.options.get(CONF_SENSOR_MAP, {}).get(cid)
+                default_keys = list(display.keys() if current is None else current)
+                fields[vol.Required(f"sensors_{cid}", default=default_keys)] = cv.multi_select(display)
+            self._sensors_schema = vol.Schema(fields)
+
+        return self.async_show_form(step_id="sensors", data_schema=self._sensors_schema)
@@ -1,85 +1,69 @@
 """Ubibot sensors with units & device classes inferred from labels (fixes Recorder warnings)."""
 from __future__ import annotations
 
-import json
 import logging
-import re
-from typing import Any, Tuple
 
 from homeassistant.components.sensor import SensorEntity, SensorStateClass, SensorDeviceClass
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 
 from .const import DOMAIN, KNOWN_FIELDS
 
 _LOGGER = logging.getLogger(__name__)
-_FIELD_RE = re.compile(r"^field(\d{1,2})$", re.IGNORECASE)
-
-def _canon(key: str | None) -> str | None:
-    if not key:
-        return None
-    m = _FIELD_RE.match(str(key).strip())
-    if not m:
-        return None
-    return f"field{int(m.group(1))}"
-
-def _extract_labels(ch: dict[str, Any]) -> dict[str, str]:
-    labels: dict[str, str] = {}
-    for k, v in ch.items():
-        ck = _canon(k)
-        if ck and isinstance(v, str) and v.strip():
-            labels[ck] = v.strip()
-    return labels
-
-def _extract_lastvalues_map(lv: Any) -> dict[str, Any]:
-    if isinstance(lv, str):
-        try:
-            lv = json.loads(lv)
-        except Exception:
-            lv = {}
-    if not isinstance(lv, dict):
-        return {}
-    m: dict[str, Any] = {}
-    for k, v in lv.items():
-        ck = _canon(k)
-        if ck:
-            m[ck] = v
-    return m
+
+# (needle, unless, unit, device class) scanned in order: more specific first.
+# A needle only matches when the label does not also contain `unless`.
+_UNIT_RULES: tuple[tuple[str, str | None, str, SensorDeviceClass | None], ...] = (
+    ("temperature", None, "°C", SensorDeviceClass.TEMPERATURE),
+    ("temp", None, "°C", SensorDeviceClass.TEMPERATURE),
+    ("°c", None, "°C", SensorDeviceClass.TEMPERATURE),
+    ("deg c", None, "°C", SensorDeviceClass.TEMPERATURE),
+    ("humidity", None, "%", SensorDeviceClass.HUMIDITY),
+    ("humid", None, "%", SensorDeviceClass.HUMIDITY),
+    ("%rh", None, "%", SensorDeviceClass.HUMIDITY),
+    ("relative humidity", None, "%", SensorDeviceClass.HUMIDITY),
+    ("illum", None, "lx", None),
+    ("light", None, "lx", None),
+    ("lux", None, "lx", None),
+    ("lx", None, "lx", None),
+    ("rssi", None, "dBm", None),
+    ("wifi", None, "dBm", None),
+    ("wi-fi", None, "dBm", None),
+    ("signal", None, "dBm", None),
+    ("battery", None, "%", SensorDeviceClass.BATTERY),
+    ("pressure", None, "hPa", SensorDeviceClass.PRESSURE),
+    ("baro", None, "hPa", SensorDeviceClass.PRESSURE),
+    ("hpa", None, "hPa", SensorDeviceClass.PRESSURE),
+    ("voltage", "uv", "V", SensorDeviceClass.VOLTAGE),
+    ("volt", "uv", "V", SensorDeviceClass.VOLTAGE),
+    ("vdc", "uv", "V", SensorDeviceClass.VOLTAGE),
+    (" v", "uv", "V", SensorDeviceClass.VOLTAGE),
+    ("current", None, "A", SensorDeviceClass.CURRENT),
+    ("amp", None, "A", SensorDeviceClass.CURRENT),
+    ("ma", None, "A", SensorDeviceClass.CURRENT),
+    (" a", None, "A", SensorDeviceClass.CURRENT),
+    ("power", None, "W", SensorDeviceClass.POWER),
+    ("watt", None, "W", SensorDeviceClass.POWER),
+    (" w", None, "W", SensorDeviceClass.POWER),
+    ("energy", None, "kWh", SensorDeviceClass.ENERGY),
+    ("kwh", None, "kWh", SensorDeviceClass.ENERGY),
+    ("wh", None, "kWh", SensorDeviceClass.ENERGY),
+    ("co2", None, "ppm", None),
+    ("carbon dioxide", None, "ppm", None),
+    ("tvoc", None, "ppb", None),
+    ("voc", None, "ppb", None),
+)
 
 def _infer_unit_and_class(label: str) -> tuple[str | None, SensorDeviceClass | None]:
     """Heuristic: map common field labels to HA units/device classes."""
     if not label:
         return None, None
     s = label.lower()
-    def has(*subs): return any(x in s for x in subs)
-
-    # Order matters: more specific first
-    if has("temperature", "temp", "°c", "deg c"):
-        return "°C", SensorDeviceClass.TEMPERATURE
-    if has("humidity", "humid", "%rh", "relative humidity"):
-        return "%", SensorDeviceClass.HUMIDITY
-    if has("illum", "light", "lux", "lx"):
-        return "lx", None
-    if has("rssi", "wifi", "wi-fi", "signal"):
-        return "dBm", None
-    if has("battery"):
-        return "%", SensorDeviceClass.BATTERY
-    if has("pressure", "baro", "hpa"):
-        return "hPa", SensorDeviceClass.PRESSURE
-    if has("voltage", "volt", "vdc", " v") and not has("uv"):
-        return "V", SensorDeviceClass.VOLTAGE
-    if has("current", "amp", "ma", " a"):
-        return "A", SensorDeviceClass.CURRENT
-    if has("power", "watt", " w"):
-        return "W", SensorDeviceClass.POWER
-    if has("energy", "kwh", "wh"):
-        return "kWh", SensorDeviceClass.ENERGY
-    if has("co2", "carbon dioxide"):
-        return "ppm", None
-    if has("tvoc", "voc"):
-        return "ppb", None
+    for needle, unless, unit, devclass in _UNIT_RULES:
+        if needle in s and not (unless and unless in s):
+            return unit, devclass
     # Default: no unit/class
     return None, None
 
@@ -87,7 +71,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     """Create field sensors from the preloaded coordinators."""
     store = hass.data[DOMAIN][entry.entry_id]
     channels: list[dict[str, str]] = store.get("channels", [])
-    sensor_map: dict[str, list[str]] = store.get("sensor_map", {})
+    sensor_map: dict[str, frozenset[str]] = store.get("sensor_map_norm", {})
     coordinators = store.get("coordinators", {})
 
     entities: list[SensorEntity] = []
@@ -95,7 +79,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     for ch in channels:
         channel_id = str(ch.get("channel_id"))
         channel_name = ch.get("name") or channel_id
-        selected_fields = set((f or "").lower() for f in sensor_map.get(channel_id, []))
+        selected_fields = sensor_map.get(channel_id, frozenset())
 
         coord = coordinators.get(channel_id)
         if coord is None:
@@ -103,9 +87,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
             continue
 
         ch_payload = (coord.data or {}).get("channel", {})
-        labels = _extract_labels(ch_payload)
-        lv_map = _extract_lastvalues_map(ch_payload.get("last_values"))
-        fields = {**{k: labels.get(k, k) for k in lv_map.keys()}, **labels}
+        labels = coord.labels
+        lv_map = ch_payload.get("_lv_canon") or {}
+        fields = {k: labels.get(k, k) for k in lv_map}
+        fields.update(labels)
         if not fields:
             fields = {k: k for k in KNOWN_FIELDS[:10]}
 
@@ -134,6 +119,7 @@ class UbibotFieldSensor(CoordinatorEntity, SensorEntity):
             self._attr_entity_registry_enabled_default = False
         self._attr_unique_id = f"{DOMAIN}_{coordinator.channel_id}_{field_key}"
         self._attr_name = f"{coordinator.channel_name} {self._label}"
+        self._attr_native_value = self._current_value()
 
     @property
     def device_info(self):
@@ -144,12 +130,10 @@ class UbibotFieldSensor(CoordinatorEntity, SensorEntity):
             "model": "Channel",
         }
 
-    @property
-    def native_value(self):
-        data = self.coordinator.data or {}
-        ch = data.get("channel", {})
-        lv_map = _extract_lastvalues_map(ch.get("last_values"))
-        v = lv_map.get(self._field_key)
-        if isinstance(v, dict) and "value" in v:
-            return v.get("value")
-        return v
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._attr_native_value = self._current_value()
+        self.async_write_ha_state()
+
+    def _current_value(self):
+        return (self.coordinator.data or {}).get("channel", {}).get("_values", {}).get(self._field_key)
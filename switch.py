@@ -1,56 +1,110 @@
 """Ubibot SP1 switch entity (only for product_id 'ubibot-sp1a')."""
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 from typing import Any
 
-from aiohttp import ClientError
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
+from aiohttp.hdrs import USER_AGENT
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util.ssl import get_default_context
+from yarl import URL
 
-from .const import DOMAIN, API_BASE
+from .const import DOMAIN, API_BASE, SP1_PRODUCT_ID
 
 _LOGGER = logging.getLogger(__name__)
 
+# Bound connect/read separately so time queued for a pooled connection is not counted.
+_CMD_TIMEOUT = ClientTimeout(total=None, sock_connect=5, sock_read=15)
+
+# last_values keys that may reflect the relay state, in priority order
+_STATE_KEYS = ("port1_state", "switch", "relay", "sp1_state", "switch_state")
+_STATE_KEYS_SET = frozenset(_STATE_KEYS)
+# Relay values as reported by the API; unknown strings fall through to the next key
+_COERCE = {
+    "0": False, "1": True,
+    "off": False, "on": True,
+    "false": False, "true": True,
+    "disabled": False, "enabled": True,
+}
+
+def _is_sp1(coord) -> bool:
+    pid = ((coord.data or {}).get("channel") or {}).get("product_id")
+    # Fast path for the exact lowercase id the API normally returns; no new string.
+    return pid == SP1_PRODUCT_ID or (isinstance(pid, str) and pid.lower() == SP1_PRODUCT_ID)
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     """Create an on/off switch for SP1 devices only."""
     store = hass.data[DOMAIN][entry.entry_id]
     channels = store.get("channels", [])
     coordinators = store.get("coordinators", {})
 
-    entities: list[SwitchEntity] = []
-
-    for ch in channels:
-        channel_id = str(ch.get("channel_id"))
-        channel_name = ch.get("name") or channel_id
-        coord = coordinators.get(channel_id)
-        if not coord:
-            continue
-
-        product_id = ((coord.data or {}).get("channel") or {}).get("product_id")
-        if str(product_id).lower() != "ubibot-sp1a":
-            continue
+    sp1_coords = [
+        coord
+        for coord in (coordinators.get(str(ch.get("channel_id"))) for ch in channels)
+        if coord is not None and _is_sp1(coord)
+    ]
+    if not sp1_coords:
+        return
 
-        entities.append(UbibotSP1Switch(coord))
+    # SP1 commands get their own small pool so toggles never queue behind polling.
+    cmd_session = ClientSession(
+        connector=TCPConnector(ssl=get_default_context(), limit=4, limit_per_host=4),
+        headers={USER_AGENT: SERVER_SOFTWARE},
+    )
+    entry.async_on_unload(cmd_session.close)
 
-    if entities:
-        async_add_entities(entities, update_before_add=False)
+    entities: list[SwitchEntity] = [UbibotSP1Switch(coord, cmd_session) for coord in sp1_coords]
+    async_add_entities(entities)
 
 class UbibotSP1Switch(CoordinatorEntity, SwitchEntity):
     """Switch entity controlling an SP1 smart plug (single port: port1)."""
 
+    # Entity bases keep a __dict__ for the _attr_* machinery; these attributes get slots.
+    __slots__ = (
+        "_cmd_session",
+        "_cmd_urls",
+        "_pending",
+        "_pending_state",
+        "_last_ch",
+        "_last_available",
+        "_commanded_state",
+    )
+
     _attr_has_entity_name = True
 
-    def __init__(self, coordinator) -> None:
+    # command_string payloads indexed by set_state (0 = off, 1 = on)
+    _CMD_STRINGS = (
+        '{"action":"command","set_state":0,"s_port":"port1"}',
+        '{"action":"command","set_state":1,"s_port":"port1"}',
+    )
+
+    def __init__(self, coordinator, cmd_session: ClientSession) -> None:
         super().__init__(coordinator)
+        self._cmd_session = cmd_session
         self._attr_name = "Switch"
         self._attr_unique_id = f"{DOMAIN}_{coordinator.channel_id}_sp1_switch"
-        # Optimistic state; will be refined after a refresh
-        self._is_on = None
+        # The channel and account never change for this entity, so build the request once
+        cmd_url = URL(f"{API_BASE}/channels/{coordinator.channel_id}/commands")
+        self._cmd_urls = tuple(
+            cmd_url.with_query({"account_key": coordinator.account_key, "command_string": cmd})
+            for cmd in self._CMD_STRINGS
+        )
+        # In-flight command POST and the state it sets; identical requests share it
+        self._pending: asyncio.Task | None = None
+        self._pending_state: int | None = None
+        # Channel payload and availability last written to the state machine
+        self._last_ch: dict[str, Any] | None = None
+        self._last_available: bool | None = None
+        # Last state we commanded; used while last_values carries no relay key
+        self._commanded_state: bool | None = None
+        self._attr_is_on = self._compute_is_on()
 
     @property
     def device_info(self):
@@ -61,50 +115,82 @@ class UbibotSP1Switch(CoordinatorEntity, SwitchEntity):
             "model": "SP1",
         }
 
-    @property
-    def is_on(self) -> bool | None:
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        ch = (self.coordinator.data or {}).get("channel")
+        available = self.coordinator.last_update_success
+        if ch is self._last_ch and available == self._last_available:
+            return
+        self._last_ch = ch
+        new_is_on = self._compute_is_on()
+        # Sensor fields tick every poll; only a relay flip or availability change is news here.
+        if new_is_on == self._attr_is_on and available == self._last_available:
+            return
+        self._attr_is_on = new_is_on
+        self._last_available = available
+        super()._handle_coordinator_update()
+
+    def _compute_is_on(self) -> bool | None:
         # Try to infer from last_values if present
         ch = (self.coordinator.data or {}).get("channel") or {}
         lv = ch.get("last_values")
-        try:
-            if isinstance(lv, str):
-                lv = json.loads(lv)
-        except Exception:
-            lv = None
-        if isinstance(lv, dict):
+        if isinstance(lv, dict) and not _STATE_KEYS_SET.isdisjoint(lv):
             # Heuristics: common keys we might see reflecting current relay state
-            for k in ("port1_state", "switch", "relay", "sp1_state", "switch_state"):
-                if k in lv:
-                    v = lv.get(k)
-                    if isinstance(v, (int, float)):
-                        return bool(int(v))
-                    if isinstance(v, str):
-                        return v.lower() in ("on", "1", "true", "enabled")
-        return self._is_on
+            for k in _STATE_KEYS:
+                v = lv.get(k)
+                if v is None:
+                    continue
+                if isinstance(v, (int, float)):
+                    return bool(int(v))
+                if isinstance(v, str):
+                    r = _COERCE.get(v.lower())
+                    if r is not None:
+                        return r
+        return self._commanded_state
 
     async def _send_command(self, set_state: int) -> None:
+        """Send a command, joining an identical one that is still in flight."""
+        set_state = int(bool(set_state))
+        pending = self._pending
+        if pending is None or pending.done() or self._pending_state != set_state:
+            pending = self._pending = self.hass.async_create_task(self._post_command(set_state))
+            self._pending_state = set_state
+        # Shield so a cancelled caller does not abort a command other callers wait on.
+        await asyncio.shield(pending)
+
+    async def _post_command(self, set_state: int) -> None:
         """POST Add Command API: /channels/{id}/commands?account_key=...&command_string=..."""
-        url = f"{API_BASE}/channels/{self.coordinator.channel_id}/commands"
-        params = {
-            "account_key": self.coordinator.account_key,
-            "command_string": json.dumps({"action": "command", "set_state": int(set_state), "s_port": "port1"}),
-        }
         try:
-            async with self.coordinator.session.post(url, params=params, timeout=20) as resp:
-                text = await resp.text()
+            resp = await self._cmd_session.post(self._cmd_urls[int(bool(set_state))], timeout=_CMD_TIMEOUT)
+            try:
                 if resp.status != 200:
+                    text = await resp.text()
                     raise RuntimeError(f"HTTP {resp.status}: {text[:200]}")
-                _LOGGER.debug("SP1 command OK for %s -> %s; response: %s",
-                              self.coordinator.channel_id, set_state, text[:200])
-        except (ClientError, Exception) as err:
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    text = await resp.text()
+                    _LOGGER.debug("SP1 command OK for %s -> %s; response: %s",
+                                  self.coordinator.channel_id, set_state, text[:200])
+            finally:
+                # The body is not needed; hand the connection back to the pool right away.
+                resp.release()
+        except (ClientError, asyncio.TimeoutError) as err:
             raise RuntimeError(f"Failed to send SP1 command: {err}") from err
 
+    def _apply_optimistic_state(self, set_state: int) -> None:
+        """Patch port1_state into the coordinator data; the next poll confirms it."""
+        self._commanded_state = bool(set_state)
+        data = dict(self.coordinator.data or {})
+        ch = dict(data.get("channel") or {})
+        lv = dict(ch.get("last_values") or {})
+        lv["port1_state"] = int(set_state)
+        ch["last_values"] = lv
+        data["channel"] = ch
+        self.coordinator.async_set_updated_data(data)
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         await self._send_command(1)
-        self._is_on = True  # optimistic
-        await self.coordinator.async_request_refresh()
+        self._apply_optimistic_state(1)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         await self._send_command(0)
-        self._is_on = False  # optimistic
-        await self.coordinator.async_request_refresh()
+        self._apply_optimistic_state(0)